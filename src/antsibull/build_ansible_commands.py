@@ -4,19 +4,20 @@
 """Build Ansible packages."""
 
 import asyncio
+import contextlib
 import datetime
 import os
 import os.path
 import shutil
+import subprocess
 import tempfile
 import typing as t
-from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import aiofiles
 import aiohttp
 import asyncio_pool  # type: ignore[import]
-import sh
-from jinja2 import Template
+import build
 from packaging.version import Version as PypiVer
 from semantic_version import Version as SemVer, SimpleSpec as SemVerSpec
 
@@ -32,7 +33,8 @@ from antsibull_core.yaml import store_yaml_file
 from .build_changelog import ReleaseNotes
 from .changelog import ChangelogData, get_changelog
 from .dep_closure import check_collection_dependencies
-from .utils.get_pkg_data import get_antsibull_data
+from .utils.get_pkg_data import get_antsibull_data, get_antsibull_data_text
+from .utils.templates import get_template
 
 
 mlog = log.fields(mod=__name__)
@@ -62,10 +64,26 @@ async def get_latest_ansible_core_version(ansible_core_version: PypiVer,
     return max(newer_versions) if newer_versions else None
 
 
+@contextlib.asynccontextmanager
+async def _get_aio_session(aio_session: t.Optional[aiohttp.ClientSession]
+                           ) -> t.AsyncIterator[aiohttp.ClientSession]:
+    '''
+    Yield the given aiohttp client session, or create and manage a new one if none was given.
+    '''
+    if aio_session is not None:
+        yield aio_session
+        return
+    lib_ctx = app_context.lib_ctx.get()
+    connector = aiohttp.TCPConnector(limit=lib_ctx.thread_max, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector) as new_session:
+        yield new_session
+
+
 async def get_collection_and_core_versions(deps: t.Mapping[str, str],
                                            ansible_core_version: t.Optional[PypiVer],
                                            galaxy_url: str,
                                            ansible_core_allow_prerelease: bool = False,
+                                           aio_session: t.Optional[aiohttp.ClientSession] = None,
                                            ) -> t.Tuple[t.Dict[str, SemVer], t.Optional[PypiVer]]:
     """
     Retrieve the latest version of each collection.
@@ -75,11 +93,13 @@ async def get_collection_and_core_versions(deps: t.Mapping[str, str],
         release.
     :arg galaxy_url: The url for the galaxy server to use.
     :arg ansible_core_allow_prerelease: Whether to allow prereleases for ansible-core
+    :arg aio_session: Optional aiohttp client session to use. If not provided, a new session is
+        created for the duration of this call.
     :returns: Tuple consisting of a dict mapping collection name to latest version, and of the
         ansible-core version if it was provided.
     """
     requestors = {}
-    async with aiohttp.ClientSession() as aio_session:
+    async with _get_aio_session(aio_session) as aio_session:
         lib_ctx = app_context.lib_ctx.get()
         async with asyncio_pool.AioPool(size=lib_ctx.thread_max) as pool:
             client = GalaxyClient(aio_session, galaxy_server=galaxy_url)
@@ -108,34 +128,40 @@ async def get_collection_and_core_versions(deps: t.Mapping[str, str],
 
 async def get_collection_versions(deps: t.Mapping[str, str],
                                   galaxy_url: str,
+                                  aio_session: t.Optional[aiohttp.ClientSession] = None,
                                   ) -> t.Dict[str, SemVer]:
     """
     Retrieve the latest version of each collection.
 
     :arg deps: Mapping of collection name to a version specification.
     :arg galaxy_url: The url for the galaxy server to use.
+    :arg aio_session: Optional aiohttp client session to use.
     :returns: Dict mapping collection name to latest version.
     """
-    return (await get_collection_and_core_versions(deps, None, galaxy_url))[0]
+    return (await get_collection_and_core_versions(
+        deps, None, galaxy_url, aio_session=aio_session))[0]
 
 
 async def download_collections(versions: t.Mapping[str, SemVer],
                                galaxy_url: str,
                                download_dir: str,
                                collection_cache: t.Optional[str] = None,
+                               aio_session: t.Optional[aiohttp.ClientSession] = None,
                                ) -> None:
-    requestors = {}
-    async with aiohttp.ClientSession() as aio_session:
-        lib_ctx = app_context.lib_ctx.get()
-        async with asyncio_pool.AioPool(size=lib_ctx.thread_max) as pool:
-            downloader = CollectionDownloader(aio_session, download_dir,
-                                              collection_cache=collection_cache,
-                                              galaxy_server=galaxy_url)
-            for collection_name, version in versions.items():
-                requestors[collection_name] = await pool.spawn(
-                    downloader.download(collection_name, version))
+    lib_ctx = app_context.lib_ctx.get()
+    sem = asyncio.Semaphore(lib_ctx.thread_max)
+    async with _get_aio_session(aio_session) as aio_session:
+        downloader = CollectionDownloader(aio_session, download_dir,
+                                          collection_cache=collection_cache,
+                                          galaxy_server=galaxy_url)
 
-            await asyncio.gather(*requestors.values())
+        async def download_collection(collection_name: str, version: SemVer) -> None:
+            async with sem:
+                await downloader.download(collection_name, version)
+
+        # Schedule all downloads at once; the semaphore caps how many run concurrently
+        await asyncio.gather(*(download_collection(collection_name, version)
+                               for collection_name, version in versions.items()))
 
 
 #
@@ -156,22 +182,25 @@ def write_manifest(package_dir: str,
                    release_notes: t.Optional[ReleaseNotes] = None,
                    debian: bool = False) -> None:
     manifest_file = os.path.join(package_dir, 'MANIFEST.in')
+    lines = [
+        'include COPYING',
+        'include README.rst',
+        'include build-ansible.sh',
+    ]
+    if release_notes:
+        lines.append(f'include {release_notes.changelog_filename}')
+        lines.append(f'include {release_notes.porting_guide_filename}')
+    if debian:
+        lines.append('include debian/*')
+    lines.append('recursive-include ansible_collections/ **')
     with open(manifest_file, 'w', encoding='utf-8') as f:
-        f.write('include COPYING\n')
-        f.write('include README.rst\n')
-        f.write('include build-ansible.sh\n')
-        if release_notes:
-            f.write(f'include {release_notes.changelog_filename}\n')
-            f.write(f'include {release_notes.porting_guide_filename}\n')
-        if debian:
-            f.write('include debian/*\n')
-        f.write('recursive-include ansible_collections/ **\n')
+        f.write('\n'.join(lines) + '\n')
 
 
 def write_release_py(ansible_version: PypiVer, ansible_collections_dir: str) -> None:
     release_filename = os.path.join(ansible_collections_dir, 'ansible_release.py')
 
-    release_tmpl = Template(get_antsibull_data('ansible-release_py.j2').decode('utf-8'))
+    release_tmpl = get_template('ansible-release_py.j2')
     release_contents = release_tmpl.render(version=ansible_version)
 
     with open(release_filename, 'w', encoding='utf-8') as f:
@@ -181,7 +210,7 @@ def write_release_py(ansible_version: PypiVer, ansible_collections_dir: str) ->
 def write_ansible_community_py(ansible_version: PypiVer, ansible_collections_dir: str) -> None:
     release_filename = os.path.join(ansible_collections_dir, 'ansible_community.py')
 
-    release_tmpl = Template(get_antsibull_data('ansible-community.py.j2').decode('utf-8'))
+    release_tmpl = get_template('ansible-community.py.j2')
     release_contents = release_tmpl.render(version=ansible_version)
 
     with open(release_filename, 'w', encoding='utf-8') as f:
@@ -196,7 +225,7 @@ def write_setup(ansible_version: PypiVer,
                 python_requires: str) -> None:
     setup_filename = os.path.join(package_dir, 'setup.py')
 
-    setup_tmpl = Template(get_antsibull_data('ansible-setup_py.j2').decode('utf-8'))
+    setup_tmpl = get_template('ansible-setup_py.j2')
     setup_contents = setup_tmpl.render(
         version=ansible_version,
         ansible_core_package_name=get_ansible_core_package_name(ansible_core_version),
@@ -233,26 +262,41 @@ def write_debian_directory(ansible_version: PypiVer,
     os.mkdir(debian_dir, mode=0o700)
     debian_files = ('changelog.j2', 'control.j2', 'copyright', 'rules')
     ansible_core_package_name = get_ansible_core_package_name(ansible_core_version)
+    # Compute the timestamp once; it is the same for every templated file
+    date_str = datetime.datetime.utcnow().strftime('%a, %d %b %Y %T +0000')
+
+    # Render all contents in memory first, then write each file in one go
+    contents = {}
     for filename in debian_files:
-        # Don't use os.path.join here, the get_data docs say it should be
+        # Don't use os.path.join here, templates and get_data want the name to be
         # slash-separated.
         src_pkgfile = 'debian/' + filename
-        data = get_antsibull_data(src_pkgfile).decode('utf-8')
 
         if filename.endswith('.j2'):
             filename = filename.replace('.j2', '')
             # If the file is a template, send it in vars it might need
-            # and update 'data' to be the result.
-            tmpl = Template(data)
+            # and use the result as the file's contents.
+            tmpl = get_template(src_pkgfile)
             data = tmpl.render(
                 version=str(ansible_version),
-                date=datetime.datetime.utcnow().strftime('%a, %d %b %Y %T +0000'),
+                date=date_str,
                 ansible_core_package_name=ansible_core_package_name,
             )
+        else:
+            data = get_antsibull_data_text(src_pkgfile)
+
+        contents[filename] = data
 
+    def write_debian_file(item: t.Tuple[str, str]) -> None:
+        filename, data = item
         with open(os.path.join(debian_dir, filename), 'w', encoding='utf-8') as f:
             f.write(data)
 
+    # The writes are independent, so let them overlap
+    with ThreadPoolExecutor(max_workers=len(contents)) as executor:
+        for dummy_ in executor.map(write_debian_file, contents.items()):
+            pass
+
 
 def write_galaxy_requirements(filename: str, included_versions: t.Mapping[str, str]) -> None:
     galaxy_reqs = []
@@ -268,53 +312,49 @@ def write_galaxy_requirements(filename: str, included_versions: t.Mapping[str, s
     })
 
 
-def show_warnings(result: sh.RunningCommand, **kwargs) -> None:
-    stderr = result.stderr.decode('utf-8').strip()
-    if stderr:
-        logger = mlog.fields(**kwargs)
+def _quiet_build_runner(cmd: t.Sequence[str],
+                        cwd: t.Optional[str] = None,
+                        extra_environ: t.Optional[t.Mapping[str, str]] = None) -> None:
+    """
+    Run a build backend hook without inheriting our stdio.
+
+    Like pyproject_hooks.quiet_subprocess_runner, but the backend's stderr (setuptools
+    warnings and the like) is forwarded through our logger instead of being dropped,
+    and on failure the captured output is logged before the error is raised.
+    """
+    env = os.environ.copy()
+    if extra_environ:
+        env.update(extra_environ)
+    result = subprocess.run(list(cmd), cwd=cwd, env=env, check=False,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    logger = mlog.fields(func='_quiet_build_runner')
+    stderr = result.stderr.decode('utf-8', errors='surrogateescape').strip()
+    if result.returncode != 0:
+        for line in result.stdout.decode('utf-8', errors='surrogateescape').splitlines():
+            logger.error(line)
         for line in stderr.splitlines():
-            logger.warning(line)
+            logger.error(line)
+        raise subprocess.CalledProcessError(result.returncode, list(cmd),
+                                            output=result.stdout, stderr=result.stderr)
+    for line in stderr.splitlines():
+        logger.warning(line)
 
 
-def make_dist(ansible_dir: str, dest_dir: str) -> None:
-    show_warnings(
-        # pyre-ignore[16], pylint:disable-next=no-member
-        sh.python('setup.py', 'sdist', _cwd=ansible_dir),
-        func='make_dist',
-    )
-    dist_dir = os.path.join(ansible_dir, 'dist')
-    files = os.listdir(dist_dir)
-    if len(files) != 1:
-        raise Exception('python setup.py sdist should only have created one file')
+def build_sdist(ansible_dir: str, dest_dir: str) -> str:
+    """Build a source distribution for the project in ``ansible_dir`` directly into ``dest_dir``."""
+    builder = build.ProjectBuilder(ansible_dir, runner=_quiet_build_runner)
+    return builder.build('sdist', dest_dir)
 
-    shutil.move(os.path.join(dist_dir, files[0]), dest_dir)
 
+def make_dist(ansible_dir: str, dest_dir: str) -> None:
+    build_sdist(ansible_dir, dest_dir)
 
-def make_dist_with_wheels(ansible_dir: str, dest_dir: str) -> None:
-    show_warnings(
-        # pyre-ignore[16], pylint:disable-next=no-member
-        sh.python('setup.py', 'sdist', 'bdist_wheel', _cwd=ansible_dir),
-        func='make_dist_with_wheels',
-    )
-    dist_dir = os.path.join(ansible_dir, 'dist')
-    files = os.listdir(dist_dir)
-    tarball_count = 0
-    wheel_count = 0
-    for file in files:
-        if file.endswith('.tar') or file.endswith('.tar.gz'):
-            tarball_count += 1
-        elif file.endswith('.whl'):
-            wheel_count += 1
-        else:
-            tarball_count = 2  # the number is wrong, but this triggers an error
-            break
-    if tarball_count != 1 or wheel_count == 0:
-        raise Exception(
-            "python setup.py sdist bdist_wheel should have created exactly one tarball and at"
-            f" least one wheel (got {files})")
 
-    for file in files:
-        shutil.move(os.path.join(dist_dir, file), dest_dir)
+def make_dist_with_wheels(ansible_dir: str, dest_dir: str) -> None:
+    builder = build.ProjectBuilder(ansible_dir, runner=_quiet_build_runner)
+    builder.build('sdist', dest_dir)
+    builder.build('wheel', dest_dir)
 
 
 def write_build_script(ansible_version: PypiVer,
@@ -323,7 +363,7 @@ def write_build_script(ansible_version: PypiVer,
     """Write a build-script that tells how to build this tarball."""
     build_ansible_filename = os.path.join(package_dir, 'build-ansible.sh')
 
-    build_ansible_tmpl = Template(get_antsibull_data('build-ansible.sh.j2').decode('utf-8'))
+    build_ansible_tmpl = get_template('build-ansible.sh.j2')
     build_ansible_contents = build_ansible_tmpl.render(version=ansible_version,
                                                        ansible_core_version=ansible_core_version)
 
@@ -490,7 +530,7 @@ def compile_collection_exclude_paths(collection_names: t.Collection[str],
     return sorted(result), sorted(ignored_files)
 
 
-def rebuild_single_command() -> int:
+async def _rebuild_single_command() -> int:
     app_ctx = app_context.app_ctx.get()
 
     deps_filename = os.path.join(app_ctx.extra['data_dir'], app_ctx.extra['deps_file'])
@@ -511,8 +551,8 @@ def rebuild_single_command() -> int:
         os.mkdir(download_dir, mode=0o700)
 
         # Download included collections
-        asyncio.run(download_collections(included_versions, app_ctx.galaxy_url,
-                                         download_dir, app_ctx.collection_cache))
+        await download_collections(included_versions, app_ctx.galaxy_url,
+                                   download_dir, app_ctx.collection_cache)
 
         # Get Ansible changelog, add new release
         ansible_changelog = ChangelogData.ansible(
@@ -526,11 +566,10 @@ def rebuild_single_command() -> int:
             collection_cache=app_ctx.collection_cache,
             ansible_changelog=ansible_changelog)
 
-        # Create package and collections directories
+        # Create package and collections directories in one go
         package_dir = os.path.join(tmp_dir, f'ansible-{app_ctx.extra["ansible_version"]}')
-        os.mkdir(package_dir, mode=0o700)
         ansible_collections_dir = os.path.join(package_dir, 'ansible_collections')
-        os.mkdir(ansible_collections_dir, mode=0o700)
+        os.makedirs(ansible_collections_dir, mode=0o700)
 
         # Write the ansible release info to the collections dir
         write_release_py(app_ctx.extra['ansible_version'], ansible_collections_dir)
@@ -540,16 +579,10 @@ def rebuild_single_command() -> int:
             write_ansible_community_py(app_ctx.extra['ansible_version'], ansible_collections_dir)
 
         # Install collections
-        # TODO: PY3.8:
-        # collections_to_install = [p for f in os.listdir(download_dir)
-        #                           if os.path.isfile(p := os.path.join(download_dir, f))]
-        collections_to_install = []
-        for collection in os.listdir(download_dir):
-            path = os.path.join(download_dir, collection)
-            if os.path.isfile(path):
-                collections_to_install.append(path)
+        with os.scandir(download_dir) as dir_entries:
+            collections_to_install = [entry.path for entry in dir_entries if entry.is_file()]
 
-        asyncio.run(install_together(collections_to_install, ansible_collections_dir))
+        await install_together(collections_to_install, ansible_collections_dir)
 
         # Compose and write release notes to destination directory
         release_notes = ReleaseNotes.build(changelog)
@@ -603,13 +636,34 @@ def rebuild_single_command() -> int:
     return 0
 
 
+def rebuild_single_command() -> int:
+    # Run all async phases on a single event loop instead of setting up and
+    # tearing one down per phase.
+    return asyncio.run(_rebuild_single_command())
+
+
 #
 # Code to make one sdist per collection
 #
 
 
+class CollectionSourceDir(t.NamedTuple):
+    """A collection source directory created by install_separately, with parsed name/version."""
+
+    name: str
+    version: str
+    path: str
+
+    @classmethod
+    def from_path(cls, collection_dir: str) -> 'CollectionSourceDir':
+        """Parse name and version out of the directory name chosen by install_separately."""
+        dir_name_only = os.path.basename(collection_dir)
+        dummy_, dummy_, name, version = dir_name_only.split('-', 3)
+        return cls(name, version, collection_dir)
+
+
 async def write_collection_readme(collection_name: str, package_dir: str) -> None:
-    readme_tmpl = Template(get_antsibull_data('collection-readme.j2').decode('utf-8'))
+    readme_tmpl = get_template('collection-readme.j2')
     readme_contents = readme_tmpl.render(collection_name=collection_name)
 
     readme_filename = os.path.join(package_dir, 'README.rst')
@@ -619,7 +673,7 @@ async def write_collection_readme(collection_name: str, package_dir: str) -> Non
 async def write_collection_setup(name: str, version: str, package_dir: str) -> None:
     setup_filename = os.path.join(package_dir, 'setup.py')
 
-    setup_tmpl = Template(get_antsibull_data('collection-setup_py.j2').decode('utf-8'))
+    setup_tmpl = get_template('collection-setup_py.j2')
     setup_contents = setup_tmpl.render(version=version, name=name)
 
     await write_file(setup_filename, setup_contents)
@@ -628,48 +682,42 @@ async def write_collection_setup(name: str, version: str, package_dir: str) -> N
 async def write_collection_manifest(package_dir: str) -> None:
     manifest_file = os.path.join(package_dir, 'MANIFEST.in')
     async with aiofiles.open(manifest_file, 'w') as f:
-        await f.write('include README.rst\n')
-        await f.write('recursive-include ansible_collections/ **\n')
+        await f.write('include README.rst\n'
+                      'recursive-include ansible_collections/ **\n')
 
 
-async def make_collection_dist(name: str,
-                               version: str,
-                               package_dir: str,
-                               dest_dir: str) -> None:
-    # Copy boilerplate into place
-    await write_collection_readme(name, package_dir)
-    await write_collection_setup(name, version, package_dir)
-    await write_collection_manifest(package_dir)
+async def make_collection_dist(collection: CollectionSourceDir,
+                               dest_dir: str,
+                               sdist_executor: t.Optional[ProcessPoolExecutor] = None) -> None:
+    # Copy boilerplate into place; the three files are independent, so write them concurrently
+    await asyncio.gather(
+        write_collection_readme(collection.name, collection.path),
+        write_collection_setup(collection.name, collection.version, collection.path),
+        write_collection_manifest(collection.path))
 
     loop = asyncio.get_running_loop()
 
-    # Create the python sdist
-    # pyre-ignore[16], pylint:disable=no-member
-    await loop.run_in_executor(None, partial(sh.python, 'setup.py', 'sdist', _cwd=package_dir))
-    dist_dir = os.path.join(package_dir, 'dist')
-    files = os.listdir(dist_dir)
-    if len(files) != 1:
-        raise Exception('python setup.py sdist should only have created one file')
-
-    dist_file = os.path.join(dist_dir, files[0])
-    await loop.run_in_executor(None, shutil.move, dist_file, dest_dir)
+    # Create the python sdist directly in its destination. Building the sdist
+    # (tar + gzip) is CPU bound, so run it in the process pool if we got one.
+    await loop.run_in_executor(sdist_executor, build_sdist, collection.path, dest_dir)
 
 
 async def make_collection_dists(dest_dir: str, collection_dirs: t.List[str]) -> None:
     dist_creators = []
     lib_ctx = app_context.lib_ctx.get()
-    async with asyncio_pool.AioPool(size=lib_ctx.thread_max) as pool:
-        for collection_dir in collection_dirs:
-            dir_name_only = os.path.basename(collection_dir)
-            dummy_, dummy_, name, version = dir_name_only.split('-', 3)
+    # Use a process pool for the sdist builds so that they can use all cores
+    with ProcessPoolExecutor(max_workers=lib_ctx.process_max) as sdist_executor:
+        async with asyncio_pool.AioPool(size=lib_ctx.thread_max) as pool:
+            for collection_dir in collection_dirs:
+                collection = CollectionSourceDir.from_path(collection_dir)
 
-            dist_creators.append(await pool.spawn(
-                make_collection_dist(name, version, collection_dir, dest_dir)))
+                dist_creators.append(await pool.spawn(
+                    make_collection_dist(collection, dest_dir, sdist_executor)))
 
-        await asyncio.gather(*dist_creators)
+            await asyncio.gather(*dist_creators)
 
 
-def build_multiple_command() -> int:
+async def _build_multiple_command() -> int:
     app_ctx = app_context.app_ctx.get()
 
     build_filename = os.path.join(app_ctx.extra['data_dir'], app_ctx.extra['build_file'])
@@ -690,37 +738,54 @@ def build_multiple_command() -> int:
         download_dir = os.path.join(tmp_dir, 'collections')
         os.mkdir(download_dir, mode=0o700)
 
-        included_versions = asyncio.run(get_collection_versions(deps, app_ctx.galaxy_url))
-        asyncio.run(
-            download_collections(included_versions, app_ctx.galaxy_url, download_dir,
-                                 app_ctx.collection_cache))
-        # TODO: PY3.8:
-        # collections_to_install = [p for f in os.listdir(download_dir)
-        #                           if os.path.isfile(p := os.path.join(download_dir, f))]
-        collections_to_install = []
-        for collection in os.listdir(download_dir):
-            path = os.path.join(download_dir, collection)
-            if os.path.isfile(path):
-                collections_to_install.append(path)
-
-        collection_dirs = asyncio.run(install_separately(collections_to_install, download_dir))
-        asyncio.run(make_collection_dists(app_ctx.extra['sdist_dir'], collection_dirs))
-
-        # Create the ansible package that deps on the collections we just wrote
+        # Use one client session for both the version lookups and the downloads, so the
+        # keep-alive connections to the Galaxy server survive between the phases
+        async with _get_aio_session(None) as aio_session:
+            included_versions = await get_collection_versions(deps, app_ctx.galaxy_url,
+                                                              aio_session=aio_session)
+            await download_collections(included_versions, app_ctx.galaxy_url, download_dir,
+                                       app_ctx.collection_cache, aio_session=aio_session)
+        with os.scandir(download_dir) as dir_entries:
+            collections_to_install = [entry.path for entry in dir_entries if entry.is_file()]
+
+        collection_dirs = await install_separately(collections_to_install, download_dir)
+        # Kick off the per-collection sdist builds; the top-level package construction
+        # below only needs included_versions, so it can proceed while these finish
+        collection_dists_task = asyncio.ensure_future(
+            make_collection_dists(app_ctx.extra['sdist_dir'], collection_dirs))
+
+        # Create the ansible package that deps on the collections we are writing
         package_dir = os.path.join(tmp_dir, f'ansible-{app_ctx.extra["ansible_version"]}')
-        os.mkdir(package_dir, mode=0o700)
         ansible_collections_dir = os.path.join(package_dir, 'ansible_collections')
-        os.mkdir(ansible_collections_dir, mode=0o700)
-
-        # Construct the list of dependent collection packages
-        collection_deps = []
-        for collection, version in sorted(included_versions.items()):
-            collection_deps.append(f"        '{collection}>={version},<{version.next_major()}'")
-        collection_deps_str = '\n' + ',\n'.join(collection_deps)
-        write_build_script(app_ctx.extra['ansible_version'], ansible_core_version_obj, package_dir)
-        write_python_build_files(app_ctx.extra['ansible_version'], ansible_core_version_obj,
-                                 [], collection_deps_str, package_dir,
-                                 python_requires=python_requires)
+
+        def write_top_level_package() -> None:
+            os.makedirs(ansible_collections_dir, mode=0o700)
+
+            # Construct the list of dependent collection packages
+            collection_deps_str = '\n' + ',\n'.join(
+                f"        '{collection}>={version},<{version.next_major()}'"
+                for collection, version in sorted(included_versions.items()))
+            write_build_script(app_ctx.extra['ansible_version'], ansible_core_version_obj,
+                               package_dir)
+            write_python_build_files(app_ctx.extra['ansible_version'], ansible_core_version_obj,
+                                     [], collection_deps_str, package_dir,
+                                     python_requires=python_requires)
+
+        # Run the synchronous package setup in a thread so the event loop stays free
+        # to drive the collection sdist task scheduled above
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, write_top_level_package)
+        except Exception:
+            # Wind down the sdist builds before the temporary directory they are
+            # reading from gets cleaned up, and don't let their outcome mask the
+            # original error
+            collection_dists_task.cancel()
+            await asyncio.gather(collection_dists_task, return_exceptions=True)
+            raise
+
+        # Make sure all collection sdists have been written before the final dist
+        await collection_dists_task
 
         make_dist(package_dir, app_ctx.extra['sdist_dir'])
 
@@ -734,3 +799,9 @@ def build_multiple_command() -> int:
         python_requires=python_requires)
 
     return 0
+
+
+def build_multiple_command() -> int:
+    # Run all async phases on a single event loop instead of setting up and
+    # tearing one down per phase.
+    return asyncio.run(_build_multiple_command())
@@ -491,6 +491,9 @@ def insert_after_heading(lines: t.List[str], content: str) -> None:
 
 
 class ReleaseNotes:
+    __slots__ = (
+        'changelog_filename', 'changelog_bytes', 'porting_guide_filename', 'porting_guide_bytes')
+
     changelog_filename: str
     changelog_bytes: bytes
 
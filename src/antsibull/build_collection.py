@@ -7,15 +7,43 @@
 
 import json
 import os.path
+import subprocess
 import tempfile
-
-import sh
-from jinja2 import Template
+import typing as t
 
 from antsibull_core import app_context
 from antsibull_core.dependency_files import DepsFile
+from antsibull_core.logging import log
 
 from .utils.get_pkg_data import get_antsibull_data
+from .utils.templates import get_template
+
+
+mlog = log.fields(mod=__name__)
+
+
+def _run_ansible_galaxy(args: t.Sequence[str]) -> None:
+    '''
+    Run ansible-galaxy with the given arguments, capturing its output.
+
+    Its stderr is forwarded through our logger; on failure the captured output is
+    logged before the error is raised.
+    '''
+    cmd = ['ansible-galaxy'] + list(args)
+    result = subprocess.run(cmd, check=False,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    logger = mlog.fields(func='_run_ansible_galaxy')
+    stderr = result.stderr.decode('utf-8', errors='surrogateescape').strip()
+    if result.returncode != 0:
+        for line in result.stdout.decode('utf-8', errors='surrogateescape').splitlines():
+            logger.error(line)
+        for line in stderr.splitlines():
+            logger.error(line)
+        raise subprocess.CalledProcessError(result.returncode, cmd,
+                                            output=result.stdout, stderr=result.stderr)
+    for line in stderr.splitlines():
+        logger.warning(line)
 
 
 def build_collection_command():
@@ -23,8 +51,8 @@ def build_collection_command():
     with tempfile.TemporaryDirectory() as working_dir:
         collection_dir = os.path.join(working_dir, 'community', 'ansible')
 
-        # pylint:disable-next=no-member
-        sh.ansible_galaxy('collection', 'init', 'community.ansible', '--init-path', working_dir)
+        _run_ansible_galaxy(['collection', 'init', 'community.ansible',
+                             '--init-path', working_dir])
         # Copy the README.md file
         readme = get_antsibull_data('README_md.txt')
         with open(os.path.join(collection_dir, 'README.md'), 'wb') as f:
@@ -38,17 +66,14 @@ def build_collection_command():
         # Template the galaxy.yml file
         dep_string = json.dumps(deps)
         dep_string.replace(', ', ',\n    ')
-        galaxy_yml = get_antsibull_data('galaxy_yml.j2').decode('utf-8')
-        galaxy_yml_tmpl = Template(galaxy_yml)
+        galaxy_yml_tmpl = get_template('galaxy_yml.j2')
         galaxy_yml_contents = galaxy_yml_tmpl.render(version=app_ctx.extra['ansible_version'],
                                                      dependencies=dep_string)
 
         with open(os.path.join(collection_dir, 'galaxy.yml'), 'w', encoding='utf-8') as f:
             f.write(galaxy_yml_contents)
 
-        # pylint:disable-next=no-member
-        sh.ansible_galaxy('collection', 'build',
-                          '--output-path', app_ctx.extra['collection_dir'],
-                          collection_dir)
+        _run_ansible_galaxy(['collection', 'build',
+                             '--output-path', app_ctx.extra['collection_dir'], collection_dir])
 
     return 0
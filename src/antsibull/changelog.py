@@ -388,6 +388,8 @@ class CollectionMetadata:
     Stores metadata about one collection.
     '''
 
+    __slots__ = ('changelog_url',)
+
     changelog_url: t.Optional[str]
 
     def __init__(self, source: t.Optional[t.Mapping[str, t.Any]] = None):
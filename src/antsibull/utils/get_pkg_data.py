@@ -6,17 +6,32 @@
 # SPDX-FileCopyrightText: Ansible Project, 2020
 """Helper to use pkgutil.get_data without having to check the return value."""
 
+import functools
 import pkgutil
 
 
+@functools.lru_cache(maxsize=None)
 def get_antsibull_data(filename: str) -> bytes:
     '''
     Retrieve data from the antsibull.data package as bytes.
 
     The filename can be a relative path separated with '/' to access subdirectories.
     See https://docs.python.org/3/library/pkgutil.html#pkgutil.get_data for details.
+
+    The result is cached, so every file is read at most once per process.
     '''
     data = pkgutil.get_data('antsibull.data', filename)
     if data is None:
         raise RuntimeError(f"Cannot find {filename} in the antsibull.data package")
     return data
+
+
+@functools.lru_cache(maxsize=None)
+def get_antsibull_data_text(filename: str) -> str:
+    '''
+    Retrieve data from the antsibull.data package as a string.
+
+    Like :func:`get_antsibull_data`, but decodes the data as UTF-8. The decoded
+    string is cached as well.
+    '''
+    return get_antsibull_data(filename).decode('utf-8')
@@ -0,0 +1,31 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: Ansible Project, 2022
+"""Shared Jinja2 environment for templates shipped in the antsibull.data package."""
+
+from jinja2 import Environment, FunctionLoader, Template
+
+from .get_pkg_data import get_antsibull_data_text
+
+
+def _load_template_source(filename: str) -> str:
+    return get_antsibull_data_text(filename)
+
+
+#: Jinja2 environment which loads templates from the antsibull.data package. Since the
+#: package data cannot change during a run, auto_reload is disabled so that every
+#: template is compiled at most once per process.
+_TEMPLATE_ENV = Environment(loader=FunctionLoader(_load_template_source), auto_reload=False)
+
+
+def get_template(filename: str) -> Template:
+    '''
+    Retrieve a compiled template from the antsibull.data package.
+
+    The filename can be a relative path separated with '/' to access subdirectories.
+    Compiled templates are cached in the environment, so repeated calls for the same
+    filename do not re-read or re-compile the template source.
+    '''
+    return _TEMPLATE_ENV.get_template(filename)